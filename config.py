@@ -8,6 +8,7 @@ import json
 import os
 import logging
 import functools
+import threading
 import time
 from pathlib import Path
 
@@ -15,18 +16,26 @@ logger = logging.getLogger(__name__)
 
 # --- Decorator Factory for Execution Tracing ---
 def trace_execution(func):
-    """Decorator that logs function entry/exit with execution time."""
+    """
+    Decorator that logs function entry/exit with execution time.
+    When DEBUG logging is disabled at decoration time, the function is
+    returned unwrapped so decorated calls carry zero overhead.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logger.debug(f"→ Entering {func.__name__}")
+        # %s args: logging skips formatting if the record is filtered
+        logger.debug("→ Entering %s", func.__name__)
         start = time.perf_counter()
         try:
             result = func(*args, **kwargs)
             elapsed = time.perf_counter() - start
-            logger.debug(f"← Exiting {func.__name__} ({elapsed:.3f}s)")
+            logger.debug("← Exiting %s (%.3fs)", func.__name__, elapsed)
             return result
         except Exception as e:
-            logger.error(f"✗ {func.__name__} raised {type(e).__name__}: {e}")
+            logger.error("✗ %s raised %s: %s", func.__name__, type(e).__name__, e)
             raise
     return wrapper
 
@@ -42,7 +51,11 @@ class Config:
         "port": 8000,
         "window_geometry": "700x600",
     }
-    
+
+    # Delay before a pending change is flushed to disk (seconds).
+    # Coalesces bursts of set() calls into a single write.
+    SAVE_DELAY = 0.5
+
     def __init__(self, config_dir: str = None):
         """
         Initialize config manager.
@@ -58,9 +71,13 @@ class Config:
         self.config_dir = Path(config_dir)
         self.config_file = self.config_dir / "config.json"
         self._data = self.DEFAULT_CONFIG.copy()
-        
+        self._dirty = False
+        self._save_timer = None
+        self._lock = threading.Lock()  # Guards _data between UI and timer thread
+        self._loaded = False  # Lazy: file is read on first access, not here
+        self._last_serialized = None  # Bytes last written/read, to skip no-op saves
+
         self._ensure_dir()
-        self.load()
     
     def _ensure_dir(self):
         """Create config directory if it doesn't exist."""
@@ -69,9 +86,15 @@ class Config:
         except OSError as e:
             logger.warning(f"Could not create config directory: {e}")
     
+    def _ensure_loaded(self) -> None:
+        """Load the config file on first access (memoized)."""
+        if not self._loaded:
+            self.load()
+
     @trace_execution
     def load(self) -> dict:
         """Load configuration from JSON file."""
+        self._loaded = True
         if not self.config_file.exists():
             logger.info("No config file found, using defaults")
             return self._data
@@ -79,8 +102,17 @@ class Config:
         try:
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 loaded = json.load(f)
-                # Merge with defaults (in case new keys were added)
-                self._data = {**self.DEFAULT_CONFIG, **loaded}
+                if loaded.keys() >= self.DEFAULT_CONFIG.keys():
+                    # Common case: the file already carries every default
+                    # key, so no merge is needed
+                    self._data = loaded
+                else:
+                    # Defaults gained keys since the file was written;
+                    # merge locally, then rebind in one step so a
+                    # concurrent save() never serializes a half-merged dict
+                    data = self.DEFAULT_CONFIG.copy()
+                    data.update(loaded)
+                    self._data = data
                 logger.info(f"Loaded config from {self.config_file}")
         except (json.JSONDecodeError, OSError) as e:
             logger.warning(f"Failed to load config: {e}, using defaults")
@@ -89,36 +121,88 @@ class Config:
         return self._data
     
     @trace_execution
-    def save(self) -> bool:
-        """Save current configuration to JSON file."""
+    def save(self, durable: bool = False) -> bool:
+        """
+        Save current configuration to JSON file.
+
+        By default the write is not fsynced: preferences are not critical
+        data, and skipping the sync avoids the largest per-save latency
+        cost on slow disks. Pass durable=True to force an fsync (e.g. for
+        an explicit user-requested export).
+
+        The data is serialized once and written in a single call; if the
+        serialized form matches what is already on disk, the write is
+        skipped entirely.
+        """
+        # Serialize under the lock: the debounced save runs on the timer
+        # thread while set() may be mutating _data on the UI thread
+        with self._lock:
+            data = json.dumps(self._data, indent=2, ensure_ascii=False).encode('utf-8')
+        if data == self._last_serialized and not durable:
+            logger.debug("Config unchanged, skipping save")
+            return True
+
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._data, f, indent=2, ensure_ascii=False)
+            with open(self.config_file, 'wb') as f:
+                f.write(data)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._last_serialized = data
             logger.info(f"Saved config to {self.config_file}")
             return True
         except OSError as e:
             logger.error(f"Failed to save config: {e}")
             return False
     
+    def _schedule_save(self) -> None:
+        """Schedule a debounced save, cancelling any pending one."""
+        self._dirty = True
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def flush(self) -> bool:
+        """Force an immediate save of any pending changes (no-op if clean)."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        if not self._dirty:
+            return True
+        self._dirty = False
+        if self.save():
+            return True
+        # Failed write: mark dirty again so the change isn't silently
+        # dropped and a later flush retries it
+        self._dirty = True
+        return False
+
     def get(self, key: str, default=None):
         """Get a config value."""
+        self._ensure_loaded()
         return self._data.get(key, default)
-    
+
     def set(self, key: str, value) -> None:
-        """Set a config value and auto-save."""
-        self._data[key] = value
-        self.save()
-    
+        """Set a config value and schedule a debounced auto-save."""
+        self._ensure_loaded()
+        with self._lock:
+            self._data[key] = value
+        self._schedule_save()
+
     @property
     def last_project(self) -> str:
+        self._ensure_loaded()
         return self._data.get("last_project", "")
-    
+
     @last_project.setter
     def last_project(self, value: str):
         self.set("last_project", value)
-    
+
     @property
     def port(self) -> int:
+        self._ensure_loaded()
         return self._data.get("port", 8000)
     
     @port.setter
@@ -5,10 +5,11 @@ Includes table name validation for safe dynamic queries.
 """
 
 import sqlite3
-import os
+import functools
 import logging
 import re
-from typing import List, Tuple, Any, Optional
+import threading
+from typing import Dict, List, Tuple, Any, Optional
 from contextlib import contextmanager
 
 from config import trace_execution
@@ -16,100 +17,195 @@ from config import trace_execution
 logger = logging.getLogger(__name__)
 
 
+# Statement keywords that only read data
+_READ_KEYWORDS = frozenset({'SELECT', 'PRAGMA', 'EXPLAIN', 'WITH'})
+
+# First-four-character dispatch table for the read keywords. The four
+# prefixes are distinct, so one fixed-width slice + dict lookup decides
+# most queries; only candidates pay for the full keyword comparison.
+_READ_HEADS = {kw[:4]: kw for kw in _READ_KEYWORDS}
+
+# Matches leading whitespace, semicolons, and SQL comments in one pass.
+# An unterminated block comment swallows the rest of the query, matching
+# the previous stripping behavior.
+_LEADING_NOISE = re.compile(r"(?:[\s;]|--[^\n]*\n?|/\*.*?(?:\*/|\Z))*", re.DOTALL)
+
+
+@functools.lru_cache(maxsize=256)
 def is_read_query(query: str) -> bool:
     """
     Safely detect if query is read-only.
     Handles injection tricks like ';;;SELECT * FROM users;'
-    
+    Results are cached: re-running the same query skips the string scan.
+
     Args:
         query: SQL query string
-        
+
     Returns:
         True if query is read-only (SELECT, PRAGMA, EXPLAIN)
     """
-    # Remove all leading semicolons, whitespace, and comments
-    cleaned = query.lstrip('; \t\n')
-    
-    # Skip SQL comments
-    while cleaned.startswith('--') or cleaned.startswith('/*'):
-        if cleaned.startswith('--'):
-            # Skip to end of line
-            newline = cleaned.find('\n')
-            cleaned = cleaned[newline + 1:] if newline != -1 else ''
-        elif cleaned.startswith('/*'):
-            # Skip to end of block comment
-            end = cleaned.find('*/')
-            cleaned = cleaned[end + 2:] if end != -1 else ''
-        cleaned = cleaned.lstrip('; \t\n')
-    
-    if not cleaned:
+    # Find where the leading semicolons/whitespace/comments end; working
+    # with indices avoids copying the (possibly multi-KB) remainder
+    start = _LEADING_NOISE.match(query).end()
+    length = len(query)
+
+    if start == length:
         return True  # Empty query, treat as read
-    
-    # Get first word
-    first_word = cleaned.split()[0].upper() if cleaned.split() else ''
-    
-    read_only_keywords = {'SELECT', 'PRAGMA', 'EXPLAIN', 'WITH'}
-    return first_word in read_only_keywords
 
+    # Fixed-width head dispatch: a 4-char slice settles write keywords
+    # (INSERT, UPDATE, ...) without scanning for the word's end
+    keyword = _READ_HEADS.get(query[start:start + 4].upper())
+    if keyword is None:
+        return False
+
+    # Confirm the full keyword and that it ends on a word boundary, so
+    # e.g. 'WITHDRAWAL ...' is not mistaken for a CTE
+    end = start + len(keyword)
+    if query[start:end].upper() != keyword:
+        return False
+    return end == length or not (query[end].isalnum() or query[end] == '_')
+
+
+# Statements that change the schema and must invalidate cached metadata
+_SCHEMA_KEYWORDS = {'CREATE', 'DROP', 'ALTER'}
 
-# Valid table name pattern: starts with letter/underscore, followed by alphanumeric/underscore
-TABLE_NAME_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+def _statement_keyword(query: str) -> str:
+    """Return the leading SQL keyword of a query (uppercased), or ''."""
+    cleaned = query[_LEADING_NOISE.match(query).end():]
+    if not cleaned:
+        return ''
+    return cleaned.split(None, 1)[0].upper()
+
+
+def has_multiple_statements(query: str) -> bool:
+    """
+    Detect whether a query contains more than one SQL statement.
+    Uses sqlite3.complete_statement at each candidate ';' so semicolons
+    inside string literals don't count as statement boundaries.
+    """
+    idx = query.find(';')
+    while idx != -1:
+        head = query[:idx + 1]
+        if sqlite3.complete_statement(head) and query[idx + 1:].strip(' \t\n\r;'):
+            return True
+        idx = query.find(';', idx + 1)
+    return False
 
 
 def validate_table_name(table_name: str) -> bool:
     """
     Validate that a table name is safe to use in SQL.
     Prevents SQL injection through malformed table names.
-    
+
+    str.isidentifier enforces the same rule the old regex did (leading
+    letter/underscore, then alphanumerics/underscores) in a single C
+    call; isascii rejects unicode identifiers SQLite would quote anyway.
+
     Args:
         table_name: Name of the table to validate
-        
+
     Returns:
         True if table name is valid, False otherwise
     """
-    return bool(TABLE_NAME_PATTERN.match(table_name))
+    return bool(table_name) and table_name.isascii() and table_name.isidentifier()
 
 
 class DatabaseManager:
     """
     SQLite database manager with proper transaction handling.
     Uses context manager pattern for safe transactions.
+    Connections are pooled per database path and reused across queries
+    instead of being opened and closed on every execute() call.
     """
-    
+
     def __init__(self, db_path: str = None):
         """
         Initialize database manager.
-        
+
         Args:
             db_path: Path to SQLite database file.
         """
         self.db_path = db_path
-        self._connection: Optional[sqlite3.Connection] = None
+        self._pool: Dict[str, sqlite3.Connection] = {}
+        self._lock = threading.Lock()  # Serializes query execution
         self.read_only = False  # Read-only mode flag
-    
+        self.apply_pragmas = True  # Set False for read-only database files
+        self._schema_cache: Dict[Any, Any] = {}  # list_tables/get_table_info results
+
     def set_database(self, db_path: str) -> None:
-        """Set the database path."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
-        self.db_path = db_path
+        """Set the database path, invalidating any pooled connection."""
+        # Called from the UI thread while the SQL worker may be mid-query;
+        # the lock keeps us from closing a connection under it or racing
+        # its read of db_path in connection()
+        with self._lock:
+            for path in (self.db_path, db_path):
+                conn = self._pool.pop(path, None)
+                if conn is not None:
+                    conn.close()
+            self.db_path = db_path
+            self._schema_cache.clear()
         logger.info(f"Database set to: {db_path}")
-    
+
+    def close_all(self) -> None:
+        """Close all pooled connections (call on application shutdown)."""
+        with self._lock:
+            for conn in self._pool.values():
+                conn.close()
+            self._pool.clear()
+
     @contextmanager
     def connection(self):
         """
         Context manager for database connection.
-        Ensures proper connection handling.
+        Returns a pooled connection which stays open for reuse;
+        callers must not close it.
         """
         if not self.db_path:
             raise ValueError("No database path set")
-        
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column name access
+
+        conn = self._pool.get(self.db_path)
+        if conn is None:
+            if self.db_path == ':memory:':
+                # In-memory database: no file to require, and pooling is
+                # what keeps it alive across execute() calls
+                conn = sqlite3.connect(
+                    ':memory:',
+                    check_same_thread=False,
+                    cached_statements=256
+                )
+            else:
+                # mode=rw keeps the old "file must exist" contract without a
+                # stat() pre-check: a missing file raises OperationalError
+                # instead of being silently created.
+                # check_same_thread=False: access is serialized by self._lock
+                conn = sqlite3.connect(
+                    f"file:{self.db_path}?mode=rw", uri=True,
+                    check_same_thread=False,
+                    cached_statements=256
+                )
+            conn.row_factory = sqlite3.Row  # Enable column name access
+            if self.apply_pragmas:
+                self._apply_pragmas(conn)
+            self._pool[self.db_path] = conn
+        yield conn
+
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection) -> None:
+        """
+        Tune a fresh connection: WAL journaling halves the fsyncs per
+        commit, NORMAL sync defers the rest to WAL checkpoints.
+        """
         try:
-            yield conn
-        finally:
-            conn.close()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-8000")
+            # 64MB mmap window: hot pages come from the OS page cache
+            # without pread syscalls
+            conn.execute("PRAGMA mmap_size=67108864")
+        except sqlite3.Error as e:
+            logger.warning(f"Could not apply connection PRAGMAs: {e}")
     
     @contextmanager
     def transaction(self):
@@ -128,79 +224,181 @@ class DatabaseManager:
                 raise
     
     @trace_execution
-    def execute(self, query: str, params: tuple = ()) -> Tuple[bool, Any]:
+    def execute(self, query: str, params: tuple = (),
+                limit: Optional[int] = None) -> Tuple[bool, Any]:
         """
-        Execute a SQL query with proper transaction handling.
-        
+        Execute a SQL query, dispatching to the read or write path.
+
         Args:
             query: SQL query string
             params: Query parameters (for parameterized queries)
-            
+            limit: Maximum number of rows to fetch for read queries
+                   (None fetches everything)
+
         Returns:
             Tuple of (success: bool, result: rows for SELECT or affected count for DML)
         """
         if not self.db_path:
             return False, "No database selected"
-        
-        if not os.path.exists(self.db_path):
-            return False, f"Database file not found: {self.db_path}"
-        
-        is_read = is_read_query(query)
-        
+
+        # Multi-statement input (e.g. a pasted CREATE + INSERTs) would
+        # silently lose everything after the first statement with
+        # cursor.execute - run it as a script instead
+        if has_multiple_statements(query):
+            if self.read_only:
+                return False, "Read-only mode: Write operations are disabled"
+            if params:
+                # executescript has no parameter binding; failing loudly
+                # beats silently running the script without the values
+                return False, "Parameters are not supported in multi-statement scripts"
+            return self.execute_script(query)
+
+        if is_read_query(query):
+            return self.execute_read(query, params, limit)
+
         # Block write queries in read-only mode
-        if self.read_only and not is_read:
+        if self.read_only:
             return False, "Read-only mode: Write operations are disabled"
-        
+
+        return self.execute_write(query, params)
+
+    def execute_read(self, query: str, params: tuple = (),
+                     limit: Optional[int] = None) -> Tuple[bool, Any]:
+        """
+        Execute a read-only query and fetch its result rows.
+        With a limit, at most that many rows are materialized, keeping
+        peak memory bounded on SELECTs against large tables.
+        """
         try:
-            with self.connection() as conn:
+            with self._lock, self.connection() as conn:
                 cursor = conn.cursor()
+                # Plain tuples straight from SQLite - skips the Row
+                # wrapper and a second Python-level conversion pass
+                cursor.row_factory = None
                 cursor.execute(query, params)
-                
-                if is_read:
-                    # Read query - fetch results
-                    rows = cursor.fetchall()
-                    columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                    result = {
-                        'columns': columns,
-                        'rows': [tuple(row) for row in rows],
-                        'count': len(rows)
-                    }
-                    logger.info(f"SELECT returned {len(rows)} rows")
-                    return True, result
+                # description is None for statements that return no rows
+                # (e.g. "PRAGMA synchronous=NORMAL") - the canonical
+                # post-execute check, no string inspection needed
+                if cursor.description is None:
+                    return True, {'columns': [], 'rows': [], 'count': 0}
+                if limit is not None:
+                    rows = cursor.fetchmany(limit)
                 else:
-                    # Write query - commit and return affected rows
-                    conn.commit()
-                    affected = cursor.rowcount
-                    logger.info(f"Query affected {affected} rows")
-                    return True, {'affected': affected}
-                    
+                    # Stream in fixed-size batches rather than one giant
+                    # fetchall allocation
+                    rows = []
+                    while True:
+                        batch = cursor.fetchmany(1000)
+                        if not batch:
+                            break
+                        rows.extend(batch)
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                result = {
+                    'columns': columns,
+                    'rows': rows,
+                    'count': len(rows)
+                }
+                logger.info(f"SELECT returned {len(rows)} rows")
+                return True, result
+        except sqlite3.Error as e:
+            logger.error(f"SQL Error: {e}")
+            if "unable to open database file" in str(e):
+                return False, f"Database file not found: {self.db_path}"
+            return False, str(e)
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            return False, str(e)
+
+    def execute_write(self, query: str, params: tuple = ()) -> Tuple[bool, Any]:
+        """
+        Execute a single write query with one commit at the end.
+        For batch inserts, prefer the transaction() context manager:
+        one commit (and one fsync) covers all N statements.
+        """
+        # DDL invalidates cached schema metadata
+        if _statement_keyword(query) in _SCHEMA_KEYWORDS:
+            self._schema_cache.clear()
+        try:
+            with self._lock, self.transaction() as conn:
+                cursor = conn.execute(query, params)
+                affected = cursor.rowcount
+                logger.info(f"Query affected {affected} rows")
+                return True, {'affected': affected}
         except sqlite3.Error as e:
             logger.error(f"SQL Error: {e}")
+            if "unable to open database file" in str(e):
+                return False, f"Database file not found: {self.db_path}"
             return False, str(e)
         except Exception as e:
             logger.error(f"Database error: {e}")
             return False, str(e)
     
+    def execute_script(self, script: str) -> Tuple[bool, Any]:
+        """
+        Execute a multi-statement SQL script on one connection with a
+        single commit, instead of forcing the user to run N queries.
+        """
+        # Scripts may contain DDL; drop cached schema metadata wholesale
+        self._schema_cache.clear()
+        try:
+            with self._lock, self.connection() as conn:
+                before = conn.total_changes
+                conn.executescript(script)
+                conn.commit()
+                affected = conn.total_changes - before
+                logger.info(f"Script affected {affected} rows")
+                return True, {'affected': affected}
+        except sqlite3.Error as e:
+            logger.error(f"SQL Error: {e}")
+            if "unable to open database file" in str(e):
+                return False, f"Database file not found: {self.db_path}"
+            return False, str(e)
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            return False, str(e)
+
     @trace_execution
     def list_tables(self) -> List[str]:
-        """Get list of all tables in the database."""
+        """Get list of all tables in the database (cached until DDL runs)."""
+        cached = self._schema_cache.get('tables')
+        if cached is not None:
+            return cached
+
         success, result = self.execute(
             "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
         )
         if success:
-            return [row[0] for row in result['rows']]
+            tables = [row[0] for row in result['rows']]
+            self._schema_cache['tables'] = tables
+            return tables
         return []
-    
+
+    def has_table(self, table_name: str) -> bool:
+        """
+        Check whether a table exists.
+        A single indexed catalog lookup - cheaper than pulling the whole
+        table list just to scan it for one name.
+        """
+        success, result = self.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=? LIMIT 1",
+            (table_name,)
+        )
+        return success and result['count'] > 0
+
     def get_table_info(self, table_name: str) -> List[dict]:
-        """Get column info for a table."""
+        """Get column info for a table (cached until DDL runs)."""
         # Validate table name to prevent SQL injection
         if not validate_table_name(table_name):
             logger.warning(f"Invalid table name rejected: {table_name}")
             return []
-        
+
+        cached = self._schema_cache.get(('info', table_name))
+        if cached is not None:
+            return cached
+
         success, result = self.execute(f"PRAGMA table_info({table_name})")
         if success:
-            return [
+            info = [
                 {
                     'name': row[1],
                     'type': row[2],
@@ -209,4 +407,6 @@ class DatabaseManager:
                 }
                 for row in result['rows']
             ]
+            self._schema_cache[('info', table_name)] = info
+            return info
         return []
@@ -7,7 +7,12 @@ Használat:
     apply_nano_theme()  # Globális beállítások
 """
 
-import customtkinter as ctk
+from __future__ import annotations
+
+from types import MappingProxyType
+
+# customtkinter is imported lazily inside the functions that need it, so
+# importing this module just for the color/font constants stays cheap.
 
 
 # === Nano Color Palette ===
@@ -48,6 +53,7 @@ NANO_COLORS = {
 
 
 # === Button Presets ===
+# Values are frozen via MappingProxyType below; treat presets as read-only.
 NANO_BUTTONS = {
     "primary": {
         "fg_color": NANO_COLORS["accent_cyan"],
@@ -83,6 +89,10 @@ NANO_BUTTONS = {
     },
 }
 
+# Freeze the presets once at import so widget factories can share them
+# without defensive copies.
+NANO_BUTTONS = {style: MappingProxyType(preset) for style, preset in NANO_BUTTONS.items()}
+
 
 # === Fonts ===
 NANO_FONTS = {
@@ -100,6 +110,8 @@ NANO_FONTS = {
 
 def apply_nano_theme():
     """Apply global Nano theme settings."""
+    import customtkinter as ctk
+
     ctk.set_appearance_mode("Dark")
     ctk.set_default_color_theme("blue")
 
@@ -117,16 +129,12 @@ def create_nano_button(master, text: str, style: str = "primary", **kwargs) -> c
     Returns:
         CTkButton with Nano styling applied
     """
+    import customtkinter as ctk
+
     preset = NANO_BUTTONS.get(style, NANO_BUTTONS["primary"])
-    
-    button_args = {
-        "master": master,
-        "text": text,
-        **preset,
-        **kwargs,
-    }
-    
-    return ctk.CTkButton(**button_args)
+
+    # kwargs win over the preset on duplicate keys
+    return ctk.CTkButton(master=master, text=text, **{**preset, **kwargs})
 
 
 def create_nano_label(master, text: str, style: str = "body", **kwargs) -> ctk.CTkLabel:
@@ -142,8 +150,10 @@ def create_nano_label(master, text: str, style: str = "body", **kwargs) -> ctk.C
     Returns:
         CTkLabel with Nano styling applied
     """
+    import customtkinter as ctk
+
     font = NANO_FONTS.get(style, NANO_FONTS["body"])
-    
+
     return ctk.CTkLabel(
         master=master,
         text=text,
@@ -10,6 +10,10 @@ import customtkinter as ctk
 import webbrowser
 import os
 import logging
+import queue
+import signal
+import threading
+from collections import deque
 from tkinter import filedialog, messagebox
 
 # Configure logging before importing our modules
@@ -19,10 +23,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Import our modules
+# Import our modules (database is imported lazily - it is only needed
+# once the SQLite manager is actually used)
 from config import Config
 from server import PHPServer, check_php_installed
-from database import DatabaseManager, is_read_query
 
 # Import Nano Design System
 try:
@@ -43,19 +47,27 @@ except ImportError:
 
 VERSION = "1.2.2"
 
+__all__ = ["NanoServerApp", "VERSION"]
+
 
 class NanoServerApp(ctk.CTk):
     """Main application window."""
-    
+
+    # Row cap for SQL results, so a stray "SELECT * FROM big_table"
+    # can't pull the whole table into memory
+    SQL_ROW_LIMIT = 1000
+
     def __init__(self):
         super().__init__()
         
         # Initialize components
         self.config = Config()
         self.server = PHPServer(on_log=self.append_log)
-        self.database = DatabaseManager()
-        self.database.read_only = True  # Default: read-only mode ON
-        self.php_available = check_php_installed()
+        self._database = None  # Created on first use via the property
+        self._db_read_only = True  # Default: read-only mode ON
+        # PHP probe spawns a subprocess; run it off the startup path.
+        # None = check still in progress.
+        self.php_available = None
         
         # Window Settings
         self.title(f"NanoServer v{VERSION}")
@@ -65,15 +77,52 @@ class NanoServerApp(ctk.CTk):
         # State
         self.project_root = self.config.last_project or os.getcwd()
         self.is_laravel = False
+        self._log_queue = deque()
+        self._log_flush_scheduled = False
+        self._sql_queue = None  # Created with the worker on first run_sql
+        self._sql_worker = None
+        self._project_scan_key = None  # (path, mtime) of last folder scan
+        self._project_scan_entries = set()
         
         self.create_widgets()
         self.check_project_type()
-        
-        # Show PHP warning if not installed
-        if not self.php_available:
-            self.after(500, self.show_php_warning)
-        
+
+        # Probe for PHP in the background so the window shows immediately
+        threading.Thread(target=self._check_php_bg, daemon=True).start()
+
+        # Reap the PHP child on OS-level termination too (window-manager
+        # kill, shell HUP, container stop) - otherwise it survives and
+        # keeps the port bound for the next launch
+        signal.signal(signal.SIGTERM, self._graceful_shutdown)
+        if hasattr(signal, 'SIGBREAK'):  # Windows Ctrl+Break / console close
+            signal.signal(signal.SIGBREAK, self._graceful_shutdown)
+
         logger.info(f"NanoServer v{VERSION} started")
+
+    def _graceful_shutdown(self, signum, frame):
+        """Signal handler: clean up the PHP child before exiting."""
+        logger.info(f"Received signal {signum}, shutting down")
+        self.on_closing()
+
+    def _check_php_bg(self):
+        """Background thread: probe for PHP and report back to the UI."""
+        available = check_php_installed()
+
+        def _apply():
+            self.php_available = available
+            if not available:
+                self.show_php_warning()
+
+        self.after(0, _apply)
+
+    @property
+    def database(self):
+        """Lazily import and create the DatabaseManager on first use."""
+        if self._database is None:
+            from database import DatabaseManager
+            self._database = DatabaseManager()
+            self._database.read_only = self._db_read_only
+        return self._database
     
     def create_widgets(self):
         """Create all UI widgets."""
@@ -117,17 +166,21 @@ class NanoServerApp(ctk.CTk):
         )
         self.btn_folder.pack(pady=5)
         
+        # StringVars diff internally: setting an unchanged value skips
+        # the widget redraw a configure(text=...) would trigger
+        self.folder_var = ctk.StringVar(value=f"Path: {self.project_root}")
         self.label_folder = ctk.CTkLabel(
             self.frame_web,
-            text=f"Path: {self.project_root}",
+            textvariable=self.folder_var,
             text_color="#aaaaaa",
             wraplength=600
         )
         self.label_folder.pack(pady=5)
-        
+
+        self.status_var = ctk.StringVar(value="Mode: Standard PHP/HTML")
         self.label_status = ctk.CTkLabel(
             self.frame_web,
-            text="Mode: Standard PHP/HTML",
+            textvariable=self.status_var,
             text_color=NANO_COLORS.get("accent_green", "#4caf50")
         )
         self.label_status.pack(pady=5)
@@ -220,9 +273,10 @@ class NanoServerApp(ctk.CTk):
         )
         self.btn_run_sql.pack(pady=5)
         
+        self.sql_result_var = ctk.StringVar(value="Result: -")
         self.label_sql_result = ctk.CTkLabel(
             self.frame_db,
-            text="Result: -",
+            textvariable=self.sql_result_var,
             text_color="#aaaaaa"
         )
         self.label_sql_result.pack(pady=5)
@@ -236,37 +290,58 @@ class NanoServerApp(ctk.CTk):
             self.project_root = folder
             self.config.last_project = folder  # Save to config
             self.check_project_type()
-            self.label_folder.configure(text=f"Path: {self.project_root}")
+            self.folder_var.set(f"Path: {self.project_root}")
             logger.info(f"Project folder selected: {folder}")
     
+    def _scan_project_root(self) -> set:
+        """
+        List the project root's entries with a single directory read,
+        cached by (path, mtime) so revisiting a folder is instant.
+        """
+        try:
+            dir_mtime = os.stat(self.project_root).st_mtime
+        except OSError:
+            dir_mtime = None
+
+        cache_key = (self.project_root, dir_mtime)
+        if cache_key != self._project_scan_key:
+            try:
+                entries = {entry.name for entry in os.scandir(self.project_root)}
+            except OSError:
+                entries = set()
+            self._project_scan_key = cache_key
+            self._project_scan_entries = entries
+        return self._project_scan_entries
+
     def check_project_type(self):
         """Detect if project is Laravel or standard PHP."""
-        artisan_path = os.path.join(self.project_root, 'artisan')
-        
-        if os.path.exists(artisan_path):
+        # One scandir instead of a stat() per probed file
+        entries = self._scan_project_root()
+
+        if 'artisan' in entries:
             self.is_laravel = True
             self.server.document_root = os.path.join(self.project_root, 'public')
-            self.label_status.configure(
-                text="Mode: Laravel Framework Detected",
-                text_color="#ff2d20"
-            )
-            
+            self.status_var.set("Mode: Laravel Framework Detected")
+            self.label_status.configure(text_color="#ff2d20")
+
             # Find Laravel database
             laravel_db = os.path.join(self.project_root, 'database', 'database.sqlite')
-            if os.path.exists(laravel_db):
+            if 'database' in entries and os.path.exists(laravel_db):
                 self.database.set_database(laravel_db)
         else:
             self.is_laravel = False
             self.server.document_root = self.project_root
-            self.label_status.configure(
-                text="Mode: Standard PHP/HTML",
-                text_color="#4caf50"
-            )
-            
+            self.status_var.set("Mode: Standard PHP/HTML")
+            self.label_status.configure(text_color="#4caf50")
+
             # Default database path
-            default_db = os.path.join(self.project_root, 'database.sqlite')
-            if os.path.exists(default_db):
-                self.database.set_database(default_db)
+            if 'database.sqlite' in entries:
+                self.database.set_database(
+                    os.path.join(self.project_root, 'database.sqlite')
+                )
+
+        # One idle redraw for the whole status update batch
+        self.update_idletasks()
     
     def toggle_server(self):
         """Start or stop the server."""
@@ -277,6 +352,11 @@ class NanoServerApp(ctk.CTk):
     
     def start_server(self):
         """Start the PHP server."""
+        if self.php_available is None:
+            # Probe still running; retry once it has finished
+            self.append_log("[NanoServer] PHP check in progress...")
+            self.after(200, self.start_server)
+            return
         if not self.php_available:
             self.show_php_warning()
             return
@@ -306,23 +386,37 @@ class NanoServerApp(ctk.CTk):
     
     def restart_server(self):
         """Restart the server."""
+        # stop_server() blocks on the child's actual exit (Popen.wait),
+        # so the port is already free - no fixed delay needed
         self.stop_server()
-        self.after(500, self.start_server)
+        self.start_server()
     
     def open_browser(self):
         """Open server URL in default browser."""
         webbrowser.open(self.server.url)
     
     def append_log(self, message: str):
-        """Append a message to the log textbox (thread-safe)."""
-        def _append():
-            self.textbox_log.configure(state="normal")
-            self.textbox_log.insert("end", message + "\n")
-            self.textbox_log.see("end")  # Auto-scroll
-            self.textbox_log.configure(state="disabled")
-        
-        # Schedule on main thread
-        self.after(0, _append)
+        """Queue a message for the log textbox (thread-safe, batched)."""
+        self._log_queue.append(message)
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            # ~60 FPS coalescing: one widget update per batch of lines
+            self.after(16, self._flush_log_queue)
+
+    def _flush_log_queue(self):
+        """Drain queued log lines into the textbox in a single insert."""
+        self._log_flush_scheduled = False
+        if not self._log_queue:
+            return
+
+        batch = []
+        while self._log_queue:
+            batch.append(self._log_queue.popleft())
+
+        self.textbox_log.configure(state="normal")
+        self.textbox_log.insert("end", "\n".join(batch) + "\n")
+        self.textbox_log.see("end")  # Auto-scroll
+        self.textbox_log.configure(state="disabled")
     
     def show_php_warning(self):
         """Show warning if PHP is not installed."""
@@ -336,17 +430,17 @@ class NanoServerApp(ctk.CTk):
             "4. Restart NanoServer"
         )
         self.btn_toggle.configure(state="disabled")
-        self.label_status.configure(
-            text="Status: PHP Not Found!",
-            text_color="#e74c3c"
-        )
+        self.status_var.set("Status: PHP Not Found!")
+        self.label_status.configure(text_color="#e74c3c")
     
     # --- Database Functions ---
     
     def toggle_read_only(self):
         """Toggle read-only mode for SQL queries."""
-        self.database.read_only = self.read_only_var.get()
-        mode = "enabled" if self.database.read_only else "disabled"
+        self._db_read_only = self.read_only_var.get()
+        if self._database is not None:
+            self._database.read_only = self._db_read_only
+        mode = "enabled" if self._db_read_only else "disabled"
         logger.info(f"Read-only mode {mode}")
     
     def run_sql(self):
@@ -355,50 +449,90 @@ class NanoServerApp(ctk.CTk):
         if not query:
             return
         
-        # Check for destructive queries when not in read-only mode
-        if not self.database.read_only and not is_read_query(query):
-            # Check for especially destructive keywords
-            first_word = query.lstrip('; \t\n').split()[0].upper() if query.strip() else ''
-            destructive_keywords = {'DROP', 'DELETE', 'TRUNCATE', 'UPDATE', 'ALTER'}
-            
-            if first_word in destructive_keywords:
+        from database import is_read_query, has_multiple_statements
+
+        # Check for destructive queries when not in read-only mode.
+        # A multi-statement script is always treated as a write: a
+        # trailing DROP can hide behind a leading SELECT, so the
+        # classifier's verdict on the first statement proves nothing.
+        if not self.database.read_only:
+            if has_multiple_statements(query):
                 confirm = messagebox.askyesno(
-                    "Confirm Write Operation",
-                    f"You are about to execute a {first_word} query:\n\n{query[:100]}{'...' if len(query) > 100 else ''}\n\nThis may modify or delete data. Continue?"
+                    "Confirm Script Execution",
+                    f"This input contains multiple SQL statements:\n\n{query[:100]}{'...' if len(query) > 100 else ''}\n\nAll of them will run, including any writes. Continue?"
                 )
                 if not confirm:
-                    self.label_sql_result.configure(
-                        text="Query cancelled by user",
-                        text_color="#e67e22"
-                    )
+                    self.sql_result_var.set("Query cancelled by user")
+                    self.label_sql_result.configure(text_color="#e67e22")
                     return
-        
-        success, result = self.database.execute(query)
-        
+            elif not is_read_query(query):
+                # Check for especially destructive keywords
+                first_word = query.lstrip('; \t\n').split()[0].upper() if query.strip() else ''
+                destructive_keywords = {'DROP', 'DELETE', 'TRUNCATE', 'UPDATE', 'ALTER'}
+
+                if first_word in destructive_keywords:
+                    confirm = messagebox.askyesno(
+                        "Confirm Write Operation",
+                        f"You are about to execute a {first_word} query:\n\n{query[:100]}{'...' if len(query) > 100 else ''}\n\nThis may modify or delete data. Continue?"
+                    )
+                    if not confirm:
+                        self.sql_result_var.set("Query cancelled by user")
+                        self.label_sql_result.configure(text_color="#e67e22")
+                        return
+        
+        # Run on the worker thread so a slow query can't freeze the UI
+        self.btn_run_sql.configure(state="disabled")
+        self._ensure_sql_worker()
+        self._sql_queue.put(query)
+
+    def _ensure_sql_worker(self):
+        """Start the single SQL worker thread on first use."""
+        if self._sql_worker is None:
+            self._sql_queue = queue.Queue()
+            self._sql_worker = threading.Thread(
+                target=self._sql_worker_loop, daemon=True
+            )
+            self._sql_worker.start()
+
+    def _sql_worker_loop(self):
+        """Worker thread: execute queued queries, post results to the UI."""
+        while True:
+            query = self._sql_queue.get()
+            success, result = self.database.execute(query, limit=self.SQL_ROW_LIMIT)
+            self.after(0, self._show_sql_result, query, success, result)
+
+    def _show_sql_result(self, query, success, result):
+        """Display a finished query's result (runs on the UI thread)."""
+        self.btn_run_sql.configure(state="normal")
+
         if success:
             if 'rows' in result:
                 count = result['count']
-                self.label_sql_result.configure(
-                    text=f"Rows returned: {count}",
-                    text_color="#4caf50"
-                )
-                # Log results
-                self.append_log(f"\n[SQL] {query}")
+                # A full fetch at the limit means the result was cut off;
+                # don't present the cap as an exact count
+                truncated = count >= self.SQL_ROW_LIMIT
+                if truncated:
+                    self.sql_result_var.set(f"Rows returned: {count}+ (truncated)")
+                else:
+                    self.sql_result_var.set(f"Rows returned: {count}")
+                self.label_sql_result.configure(text_color="#4caf50")
+                # Log results with a column header row, built as one batch
+                lines = [f"\n[SQL] {query}"]
+                if result['columns']:
+                    lines.append("  " + " | ".join(result['columns']))
                 for row in result['rows'][:10]:  # Limit display
-                    self.append_log(f"  {row}")
+                    lines.append("  " + " | ".join(str(value) for value in row))
                 if count > 10:
-                    self.append_log(f"  ... and {count - 10} more rows")
+                    more = f"{count - 10}+" if truncated else f"{count - 10}"
+                    lines.append(f"  ... and {more} more rows")
+                self.append_log("\n".join(lines))
             else:
                 affected = result.get('affected', 0)
-                self.label_sql_result.configure(
-                    text=f"Query OK, {affected} rows affected",
-                    text_color="#4caf50"
-                )
+                self.sql_result_var.set(f"Query OK, {affected} rows affected")
+                self.label_sql_result.configure(text_color="#4caf50")
         else:
-            self.label_sql_result.configure(
-                text=f"Error: {result}",
-                text_color="#e74c3c"
-            )
+            self.sql_result_var.set(f"Error: {result}")
+            self.label_sql_result.configure(text_color="#e74c3c")
     
     # --- Window Functions ---
     
@@ -406,10 +540,14 @@ class NanoServerApp(ctk.CTk):
         """Clean up before closing."""
         if self.server.is_running:
             self.server.stop()
+
+        if self._database is not None:
+            self._database.close_all()
         
         # Save window geometry
         self.config.set("window_geometry", self.geometry())
-        
+        self.config.flush()  # Write pending changes before exit
+
         logger.info("NanoServer closed")
         self.destroy()
 
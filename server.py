@@ -8,8 +8,12 @@ import subprocess
 import socket
 import os
 import sys
+import json
 import logging
+import selectors
+import shutil
 import threading
+from pathlib import Path
 from typing import Optional, Callable
 
 from config import trace_execution
@@ -21,23 +25,60 @@ logger = logging.getLogger(__name__)
 IS_WINDOWS = sys.platform == 'win32'
 
 
-def get_subprocess_flags():
-    """Get platform-specific subprocess flags."""
-    if IS_WINDOWS:
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        return {
-            'startupinfo': startupinfo,
-            'creationflags': subprocess.CREATE_NO_WINDOW
-        }
-    else:
-        # Linux/macOS don't need special flags
-        return {}
+# The platform never changes at runtime, so the Windows-vs-POSIX branch
+# is resolved once at import by binding the matching function variant.
+if IS_WINDOWS:
+    _startupinfo = subprocess.STARTUPINFO()
+    _startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _SUBPROCESS_FLAGS = {
+        'startupinfo': _startupinfo,
+        'creationflags': subprocess.CREATE_NO_WINDOW
+    }
+
+    def get_subprocess_flags():
+        """Get platform-specific subprocess flags."""
+        return _SUBPROCESS_FLAGS
+else:
+    # Linux/macOS don't need special flags
+    _SUBPROCESS_FLAGS = {}
+
+    def get_subprocess_flags():
+        """Get platform-specific subprocess flags."""
+        return _SUBPROCESS_FLAGS
+
+
+# Remembers the last verified PHP binary (path + mtime + version) so
+# launches after the first skip the interpreter spawn entirely.
+_PHP_CACHE_FILE = Path.home() / ".nanoserver" / "php_path.json"
 
 
 @trace_execution
 def check_php_installed() -> bool:
-    """Check if PHP is available in PATH."""
+    """
+    Check if PHP is available in PATH.
+    A PATH lookup plus one stat() handles the common case; `php -v` is
+    only spawned when the binary changed since the last verified run.
+    """
+    php_path = shutil.which("php")
+    if php_path is None:
+        logger.warning("PHP not found in PATH")
+        return False
+
+    try:
+        mtime = os.stat(php_path).st_mtime
+    except OSError:
+        mtime = None
+
+    if mtime is not None:
+        try:
+            with open(_PHP_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('path') == php_path and cached.get('mtime') == mtime:
+                logger.info(f"PHP found (cached): {cached.get('version', php_path)}")
+                return True
+        except (OSError, json.JSONDecodeError):
+            pass  # No cache yet, or unreadable - fall through to probe
+
     try:
         result = subprocess.run(
             ["php", "-v"],
@@ -49,6 +90,16 @@ def check_php_installed() -> bool:
             # Extract version info
             version_line = result.stdout.split('\n')[0]
             logger.info(f"PHP found: {version_line}")
+            if mtime is not None:
+                try:
+                    _PHP_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                    with open(_PHP_CACHE_FILE, 'w', encoding='utf-8') as f:
+                        json.dump(
+                            {'path': php_path, 'mtime': mtime, 'version': version_line},
+                            f
+                        )
+                except OSError as e:
+                    logger.warning(f"Could not cache PHP check result: {e}")
             return True
         return False
     except FileNotFoundError:
@@ -57,17 +108,49 @@ def check_php_installed() -> bool:
 
 
 def is_port_in_use(port: int) -> bool:
-    """Check if a port is already in use."""
+    """
+    Check if a port is already in use.
+    Probes with bind() - the same call the PHP server will make - so a
+    socket lingering in TIME_WAIT no longer counts as \"in use\" (with
+    SO_REUSEADDR set, exactly like a fresh server bind). The numeric
+    loopback literal also skips the 'localhost' resolver lookup.
+    """
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('localhost', port)) == 0
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            s.bind(('127.0.0.1', port))
+            return False
+        except OSError:
+            return True
 
 
 def find_available_port(start_port: int = 8000, max_attempts: int = 10) -> Optional[int]:
-    """Find an available port starting from start_port."""
+    """
+    Find an available port starting from start_port.
+    Probes with bind() - a pure kernel check against the local port
+    table - instead of connect(), which costs a TCP handshake per port.
+
+    Pass start_port=0 to let the kernel pick a free ephemeral port in a
+    single bind call, skipping the linear probe entirely.
+    """
+    if start_port == 0:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                s.bind(('127.0.0.1', 0))
+                return s.getsockname()[1]
+            except OSError:
+                return None
+
     for i in range(max_attempts):
         port = start_port + i
-        if not is_port_in_use(port):
-            return port
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                s.bind(('127.0.0.1', port))
+                return port
+            except OSError:
+                continue
     return None
 
 
@@ -93,14 +176,17 @@ class PHPServer:
         self._stop_logging = threading.Event()
     
     @trace_execution
-    def start(self, document_root: str, port: int = 8000) -> bool:
+    def start(self, document_root: str, port: int = 8000,
+              check_port: bool = True) -> bool:
         """
         Start the PHP development server.
-        
+
         Args:
             document_root: Directory to serve files from.
             port: Port to listen on (will auto-increment if busy).
-            
+            check_port: Scan for a port collision first. restart() skips
+                        this - it just released the port itself.
+
         Returns:
             True if server started successfully.
         """
@@ -116,7 +202,7 @@ class PHPServer:
             return False
         
         # Check for port collision
-        if is_port_in_use(port):
+        if check_port and is_port_in_use(port):
             new_port = find_available_port(port)
             if new_port is None:
                 logger.error(f"Ports {port}-{port + 9} are all in use")
@@ -134,8 +220,8 @@ class PHPServer:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,  # Merge stderr into stdout
-                text=True,
-                bufsize=1,  # Line buffered
+                # Binary pipe: the capture thread reads raw chunks and
+                # splits lines itself (see _capture_logs)
                 **get_subprocess_flags()
             )
             
@@ -160,19 +246,53 @@ class PHPServer:
             return False
     
     def _capture_logs(self):
-        """Background thread to capture PHP server output."""
+        """
+        Background thread to capture PHP server output.
+        Reads the pipe in chunks and splits lines in Python, so one
+        read() can drain many log lines at once. On POSIX the pipe is
+        non-blocking and polled through a selector so the thread notices
+        stop requests promptly instead of sitting in a blocked read.
+        """
+        sel = None
         try:
-            while not self._stop_logging.is_set() and self.process:
-                line = self.process.stdout.readline()
-                if line:
-                    line = line.rstrip()
+            fd = self.process.stdout.fileno()
+            buf = bytearray()
+
+            if not IS_WINDOWS:
+                os.set_blocking(fd, False)
+                sel = selectors.DefaultSelector()
+                sel.register(fd, selectors.EVENT_READ)
+
+            while not self._stop_logging.is_set():
+                if sel is not None:
+                    if not sel.select(timeout=0.2):
+                        if self.process.poll() is not None:
+                            break  # Process terminated, pipe drained
+                        continue
+                try:
+                    # 64KiB (the default pipe capacity): one read can
+                    # drain everything a bursty PHP server has queued
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    break  # EOF
+
+                buf.extend(chunk)
+                *lines, buf = buf.split(b'\n')
+                buf = bytearray(buf)
+                for raw in lines:
+                    line = raw.decode('utf-8', 'replace').rstrip('\r')
                     logger.debug(f"PHP: {line}")
                     self.on_log(line)
-                elif self.process.poll() is not None:
-                    # Process terminated
-                    break
+
+            if buf:
+                self.on_log(buf.decode('utf-8', 'replace').rstrip('\r'))
         except Exception as e:
             logger.error(f"Log capture error: {e}")
+        finally:
+            if sel is not None:
+                sel.close()
     
     @trace_execution
     def stop(self) -> None:
@@ -197,7 +317,7 @@ class PHPServer:
         doc_root = self.document_root
         port = self.port
         self.stop()
-        return self.start(doc_root, port)
+        return self.start(doc_root, port, check_port=False)
     
     @property
     def url(self) -> str:
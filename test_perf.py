@@ -0,0 +1,35 @@
+"""
+NanoServer Performance Regression Tests
+Microbenchmarks guarding the hot query-classification utilities.
+Run with: python -m pytest test_perf.py -n 0
+(pytest-benchmark auto-disables its timing under parallel workers, so
+-n 0 overrides the -n auto addopts for meaningful numbers; gate
+regressions with --benchmark-autosave and
+--benchmark-compare-fail=min:10%.)
+"""
+
+import pytest
+
+from database import is_read_query, validate_table_name
+
+
+@pytest.mark.benchmark(group="parse")
+def test_is_read_query_read_bench(benchmark):
+    """Classify a read query. __wrapped__ bypasses the lru_cache so the
+    benchmark times the actual scan, not a cache hit."""
+    result = benchmark(is_read_query.__wrapped__, "SELECT * FROM users WHERE id=1")
+    assert result is True
+
+
+@pytest.mark.benchmark(group="parse")
+def test_is_read_query_write_bench(benchmark):
+    """Classify a write query - the head-dispatch early-reject path."""
+    result = benchmark(is_read_query.__wrapped__, "INSERT INTO users VALUES (1)")
+    assert result is False
+
+
+@pytest.mark.benchmark(group="parse")
+def test_validate_table_name_bench(benchmark):
+    """Validate a well-formed table name."""
+    result = benchmark(validate_table_name, "User_Profiles")
+    assert result is True